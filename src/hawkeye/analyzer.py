@@ -1,14 +1,40 @@
 """OpenAI-powered log analyzer."""
 
-import json
+import asyncio
+import hashlib
+import re
+from collections import OrderedDict
 from dataclasses import dataclass
 
 from openai import AsyncOpenAI
 
+from . import jsonutil
 from .buffer import IssueBatch, BufferedIssue
+from .filter import SEV_ERROR, LogFilter
 
 
-@dataclass
+# Analyses kept for recurring batches (identical issues, same model)
+RESPONSE_CACHE_SIZE = 512
+
+# Whole queries that are only a count/health question, answerable from the
+# buffer summary alone; anything more specific goes to the model
+_LOCAL_QUERY_RE = re.compile(
+    r"\s*(?:how\s+many\s+errors|error\s+count|(?:what\s+is\s+the\s+)?status"
+    r"|(?:is\s+it|are\s+we)\s+healthy)\b\s*\??\s*",
+    re.IGNORECASE,
+)
+
+
+def _decode_json(raw: str) -> dict | None:
+    """Decode a JSON object response, or return None if it isn't one."""
+    try:
+        data = jsonutil.loads(raw)
+    except ValueError:  # json.JSONDecodeError and orjson.JSONDecodeError
+        return None
+    return data if isinstance(data, dict) else None
+
+
+@dataclass(slots=True)
 class AnalysisResult:
     """Result of analyzing a batch of issues."""
 
@@ -20,7 +46,7 @@ class AnalysisResult:
     raw_response: str
 
 
-@dataclass
+@dataclass(slots=True)
 class QueryResult:
     """Result of an interactive query."""
 
@@ -33,11 +59,58 @@ class QueryResult:
 class LogAnalyzer:
     """Analyze logs using OpenAI."""
 
+    # Prompts keep their static instructions first and the log data last, so
+    # consecutive requests share a byte-identical prefix (which OpenAI's
+    # prompt caching reuses server-side).
+    _ANALYZE_SYSTEM = "You are a log analysis expert. Analyze logs and identify issues, root causes, and solutions. Always respond with valid JSON."
+
+    _ANALYZE_PREFIX = """Analyze the following log issues and provide a structured analysis.
+
+Respond in JSON format with these fields:
+- summary: A brief (1-2 sentence) summary of what's happening
+- severity: One of "critical", "high", "medium", "low"
+- root_cause: Your best assessment of the root cause (or null if unclear)
+- suggested_actions: List of recommended actions to investigate or fix
+- affected_components: List of system components that appear affected
+
+Be concise and actionable.
+
+---
+"""
+
+    _QUERY_SYSTEM = "You are a log monitoring assistant. Answer questions about system health based on log data. Always respond with valid JSON."
+
+    _QUERY_PREFIX = """Based on the log monitoring data below, answer the user's question.
+
+Respond in JSON format with:
+- answer: Direct answer to the question
+- health_status: "healthy", "degraded", or "unhealthy"
+- issues_found: Number of significant issues found
+- recommendations: List of recommendations (if any)
+
+Be concise and direct.
+
+---
+"""
+
+    _QUERY_DATA = """Summary:
+- Time range: Last {time_range_minutes} minutes
+- Total log lines: {total_log_lines}
+- Errors detected: {error_count}
+- Warnings detected: {warning_count}
+{issues_text}
+{logs_text}
+
+User question: {query}"""
+
     def __init__(
         self,
         api_key: str | None = None,
         model: str = "gpt-4o-mini",
         base_url: str | None = None,
+        cheap_model: str | None = None,
+        max_concurrent: int = 8,
+        max_retries: int = 5,
     ):
         """
         Initialize the analyzer.
@@ -46,43 +119,51 @@ class LogAnalyzer:
             api_key: OpenAI API key (defaults to OPENAI_API_KEY env var)
             model: Model to use for analysis
             base_url: Optional custom API base URL
+            cheap_model: Faster model for warning-only batches and error-free
+                queries (defaults to model, i.e. no routing)
+            max_concurrent: Maximum number of API requests in flight at once
+            max_retries: Retries (with exponential backoff) on 429s and 5xx errors
         """
-        self.client = AsyncOpenAI(api_key=api_key, base_url=base_url)
+        self.client = AsyncOpenAI(
+            api_key=api_key,
+            base_url=base_url,
+            max_retries=max_retries,
+        )
         self.model = model
-
-    async def analyze_batch(self, batch: IssueBatch) -> AnalysisResult:
-        """Analyze a batch of log issues."""
-        prompt = f"""Analyze the following log issues and provide a structured analysis.
-
-{batch.format_for_analysis()}
-
-Respond in JSON format with these fields:
-- summary: A brief (1-2 sentence) summary of what's happening
-- severity: One of "critical", "high", "medium", "low"
-- root_cause: Your best assessment of the root cause (or null if unclear)
-- suggested_actions: List of recommended actions to investigate or fix
-- affected_components: List of system components that appear affected
-
-Be concise and actionable."""
-
-        response = await self.client.chat.completions.create(
-            model=self.model,
-            messages=[
-                {
-                    "role": "system",
-                    "content": "You are a log analysis expert. Analyze logs and identify issues, root causes, and solutions. Always respond with valid JSON.",
-                },
-                {"role": "user", "content": prompt},
+        self.cheap_model = cheap_model or model
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+        self._filter = LogFilter()
+        self._response_cache: OrderedDict[str, AnalysisResult] = OrderedDict()
+
+    def _model_for_batch(self, batch: IssueBatch) -> str:
+        """Pick the cheap model unless the batch has errors or stack traces."""
+        if self.cheap_model == self.model:
+            return self.model
+
+        for issue in batch.issues:
+            if issue.filter_result.severity == SEV_ERROR:
+                return self.model
+            lines = [issue.trigger_line, *issue.context_before, *issue.context_after]
+            if any(self._filter.is_stack_trace_line(line.content) for line in lines):
+                return self.model
+
+        return self.cheap_model
+
+    def _analysis_request(self, batch: IssueBatch) -> dict:
+        """Build the chat completion request body for analyzing a batch."""
+        return {
+            "model": self._model_for_batch(batch),
+            "messages": [
+                {"role": "system", "content": self._ANALYZE_SYSTEM},
+                {"role": "user", "content": self._ANALYZE_PREFIX + batch.format_for_analysis()},
             ],
-            response_format={"type": "json_object"},
-            temperature=0.1,
-        )
-
-        raw = response.choices[0].message.content or "{}"
+            "response_format": {"type": "json_object"},
+            "temperature": 0.1,
+        }
 
-        try:
-            data = json.loads(raw)
-        except json.JSONDecodeError:
+    def _parse_analysis(self, raw: str, data: dict | None) -> AnalysisResult:
+        """Build an AnalysisResult from the model's decoded JSON response."""
+        if data is None:
             data = {
                 "summary": "Failed to parse analysis",
                 "severity": "medium",
@@ -100,6 +181,154 @@ Be concise and actionable."""
             raw_response=raw,
         )
 
+    async def _complete(self, request: dict) -> str:
+        """Run a chat completion, streaming the response, and return its content."""
+        parts = []
+        async with self._semaphore:
+            stream = await self.client.chat.completions.create(**request, stream=True)
+            async for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    parts.append(chunk.choices[0].delta.content)
+
+        return "".join(parts) or "{}"
+
+    async def analyze_batch(self, batch: IssueBatch) -> AnalysisResult:
+        """
+        Analyze a batch of log issues.
+
+        Results are cached by model and issue content (not time range), so a
+        recurring set of issues is answered without another API call.
+        """
+        request = self._analysis_request(batch)
+        key = hashlib.blake2b(
+            f"{request['model']}\0{batch.format_issues()}".encode(),
+            digest_size=16,
+        ).hexdigest()
+
+        cached = self._response_cache.get(key)
+        if cached is not None:
+            self._response_cache.move_to_end(key)
+            return cached
+
+        raw = await self._complete(request)
+        data = _decode_json(raw)
+        result = self._parse_analysis(raw, data)
+
+        # Only cache real answers, not the parse-failure placeholder
+        if data is not None:
+            self._response_cache[key] = result
+            if len(self._response_cache) > RESPONSE_CACHE_SIZE:
+                self._response_cache.popitem(last=False)
+
+        return result
+
+    async def submit_batch(self, batches: list[IssueBatch]) -> str:
+        """
+        Submit batches for offline analysis through the OpenAI Batch API.
+
+        Batch jobs cost less than regular requests but may take up to 24h.
+        Returns the batch job ID; pass it to wait_for_batch to get results.
+        """
+        requests = [
+            jsonutil.dumps(
+                {
+                    "custom_id": f"b{i}",
+                    "method": "POST",
+                    "url": "/v1/chat/completions",
+                    "body": self._analysis_request(batch),
+                }
+            )
+            for i, batch in enumerate(batches)
+        ]
+
+        async with self._semaphore:
+            input_file = await self.client.files.create(
+                file=("hawkeye-batch.jsonl", "\n".join(requests).encode()),
+                purpose="batch",
+            )
+            job = await self.client.batches.create(
+                input_file_id=input_file.id,
+                endpoint="/v1/chat/completions",
+                completion_window="24h",
+            )
+
+        return job.id
+
+    async def wait_for_batch(
+        self,
+        batch_id: str,
+        poll_interval: float = 30.0,
+    ) -> tuple[list[AnalysisResult], int]:
+        """
+        Wait for a Batch API job to finish and parse its results.
+
+        Returns the analyses in submission order and the number of requests
+        that failed within the job (and so have no analysis).
+        """
+        while True:
+            job = await self.client.batches.retrieve(batch_id)
+            if job.status == "completed":
+                break
+            if job.status in ("failed", "expired", "cancelling", "cancelled"):
+                raise RuntimeError(f"Batch {batch_id} {job.status}")
+            await asyncio.sleep(poll_interval)
+
+        # Requests rejected outright are listed in the error file
+        failed = 0
+        if job.error_file_id:
+            errors = await self.client.files.content(job.error_file_id)
+            failed = sum(1 for line in errors.text.splitlines() if line.strip())
+
+        if not job.output_file_id:
+            raise RuntimeError(f"Batch {batch_id} produced no output ({failed} requests failed)")
+
+        content = await self.client.files.content(job.output_file_id)
+
+        results: dict[int, AnalysisResult] = {}
+        for line in content.text.splitlines():
+            if not line.strip():
+                continue
+            entry = jsonutil.loads(line)
+            body = (entry.get("response") or {}).get("body") or {}
+            choices = body.get("choices") or []
+            if not choices:
+                # Answered with an error response instead of a completion
+                failed += 1
+                continue
+            raw = choices[0].get("message", {}).get("content") or "{}"
+            results[int(entry["custom_id"][1:])] = self._parse_analysis(raw, _decode_json(raw))
+
+        return [results[i] for i in sorted(results)], failed
+
+    def _try_local_answer(self, query: str, summary: dict) -> QueryResult | None:
+        """Answer simple count/health queries from the summary, or return None."""
+        if not _LOCAL_QUERY_RE.fullmatch(query):
+            return None
+
+        errors = summary["error_count"]
+        warnings = summary["warning_count"]
+        if errors > 10:
+            health = "unhealthy"
+        elif errors > 0 or warnings > 20:
+            health = "degraded"
+        else:
+            health = "healthy"
+
+        recommendations = []
+        if errors:
+            recommendations.append("Ask about the errors directly for a detailed analysis")
+
+        return QueryResult(
+            answer=(
+                f"{errors} error(s) and {warnings} warning(s) in the last "
+                f"{summary['time_range_minutes']} minutes "
+                f"({summary['total_log_lines']} log lines); status is {health}."
+            ),
+            health_status=health,
+            issues_found=summary["total_issues"],
+            recommendations=recommendations,
+        )
+
     async def answer_query(
         self,
         query: str,
@@ -107,7 +336,16 @@ Be concise and actionable."""
         recent_log_sample: list[str],
         summary: dict,
     ) -> QueryResult:
-        """Answer an interactive query about the logs."""
+        """
+        Answer an interactive query about the logs.
+
+        Error counts and health checks are answered locally from the summary;
+        anything else goes to the model.
+        """
+        local = self._try_local_answer(query, summary)
+        if local is not None:
+            return local
+
         # Format recent issues for context
         issues_text = ""
         if recent_issues:
@@ -121,44 +359,32 @@ Be concise and actionable."""
             logs_text = "\n\nSample of recent logs:\n"
             logs_text += "\n".join(recent_log_sample[-50:])  # Last 50 lines
 
-        prompt = f"""Based on the log monitoring data below, answer the user's question.
-
-Summary:
-- Time range: Last {summary['time_range_minutes']} minutes
-- Total log lines: {summary['total_log_lines']}
-- Errors detected: {summary['error_count']}
-- Warnings detected: {summary['warning_count']}
-{issues_text}
-{logs_text}
-
-User question: {query}
-
-Respond in JSON format with:
-- answer: Direct answer to the question
-- health_status: "healthy", "degraded", or "unhealthy"
-- issues_found: Number of significant issues found
-- recommendations: List of recommendations (if any)
-
-Be concise and direct."""
-
-        response = await self.client.chat.completions.create(
-            model=self.model,
-            messages=[
-                {
-                    "role": "system",
-                    "content": "You are a log monitoring assistant. Answer questions about system health based on log data. Always respond with valid JSON.",
-                },
-                {"role": "user", "content": prompt},
-            ],
-            response_format={"type": "json_object"},
-            temperature=0.1,
+        prompt = self._QUERY_PREFIX + self._QUERY_DATA.format_map(
+            {
+                **summary,
+                "issues_text": issues_text,
+                "logs_text": logs_text,
+                "query": query,
+            }
         )
 
-        raw = response.choices[0].message.content or "{}"
+        # Escalate to the main model only when there are errors to reason about
+        model = self.model if summary["error_count"] > 0 else self.cheap_model
+
+        raw = await self._complete(
+            {
+                "model": model,
+                "messages": [
+                    {"role": "system", "content": self._QUERY_SYSTEM},
+                    {"role": "user", "content": prompt},
+                ],
+                "response_format": {"type": "json_object"},
+                "temperature": 0.1,
+            }
+        )
 
-        try:
-            data = json.loads(raw)
-        except json.JSONDecodeError:
+        data = _decode_json(raw)
+        if data is None:
             data = {
                 "answer": "Unable to process query",
                 "health_status": "unknown",
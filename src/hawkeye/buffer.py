@@ -1,44 +1,64 @@
 """Log buffer for batching and maintaining rolling window."""
 
-import asyncio
-from collections import deque
+import bisect
+import itertools
+import re
+import time
+from collections import Counter, deque
+from collections.abc import Sequence
 from dataclasses import dataclass, field
-from datetime import datetime, timedelta
+from datetime import datetime
+from io import StringIO
 
 from .sources.base import LogLine
-from .filter import FilterResult
+from .filter import SEV_ERROR, SEV_WARNING, FilterResult
 
 
-@dataclass
+# Numbers (ids, ports, timings) differ between otherwise duplicate issues
+_DIGITS_RE = re.compile(r"\d+")
+
+
+@dataclass(slots=True)
 class BufferedIssue:
     """A detected issue with context."""
 
     trigger_line: LogLine
     filter_result: FilterResult
-    context_before: list[LogLine]
+    context_before: Sequence[LogLine]
     context_after: list[LogLine]
-    timestamp: datetime = field(default_factory=datetime.now)
+    ts: float = field(default_factory=time.time)  # Epoch seconds
+    count: int = 1  # Duplicates coalesced into this issue within a batch
+
+    @property
+    def timestamp(self) -> datetime:
+        """When the issue was detected."""
+        return datetime.fromtimestamp(self.ts)
 
     def format_for_analysis(self) -> str:
         """Format the issue for LLM analysis."""
-        lines = []
+        out = StringIO()
+        self._write_to(out)
+        return out.getvalue()[:-1]
 
+    def _write_to(self, out: StringIO) -> None:
+        """Write the formatted issue to out, one newline-terminated line at a time."""
         if self.context_before:
-            lines.append("--- Context (before) ---")
+            out.write("--- Context (before) ---\n")
             for line in self.context_before:
-                lines.append(f"  {line.content}")
+                out.write(f"  {line.content}\n")
 
-        lines.append(f">>> [{self.filter_result.severity.upper()}] {self.trigger_line.content}")
+        label = self.filter_result.severity.upper()
+        if self.count > 1:
+            label = f"{label} x{self.count}"
+        out.write(f">>> [{label}] {self.trigger_line.content}\n")
 
         if self.context_after:
-            lines.append("--- Context (after) ---")
+            out.write("--- Context (after) ---\n")
             for line in self.context_after:
-                lines.append(f"  {line.content}")
+                out.write(f"  {line.content}\n")
 
-        return "\n".join(lines)
 
-
-@dataclass
+@dataclass(slots=True)
 class IssueBatch:
     """A batch of issues to send for analysis."""
 
@@ -47,22 +67,51 @@ class IssueBatch:
     start_time: datetime
     end_time: datetime
 
+    # Formatted prompt text, built on first use and reused (e.g. on retries)
+    _cached_prompt: str | None = field(default=None, init=False, repr=False, compare=False)
+    _cached_issues: str | None = field(default=None, init=False, repr=False, compare=False)
+
     def format_for_analysis(self) -> str:
         """Format the entire batch for LLM analysis."""
-        parts = [
-            f"Log source: {self.source}",
-            f"Time range: {self.start_time.isoformat()} to {self.end_time.isoformat()}",
-            f"Issues detected: {len(self.issues)}",
-            "",
+        if self._cached_prompt is None:
+            total = sum(issue.count for issue in self.issues)
+            detected = str(total)
+            if total != len(self.issues):
+                detected = f"{total} ({len(self.issues)} unique)"
+
+            self._cached_prompt = (
+                f"Log source: {self.source}\n"
+                f"Time range: {self.start_time.isoformat()} to {self.end_time.isoformat()}\n"
+                f"Issues detected: {detected}\n"
+                "\n"
+                + self.format_issues()
+            )
+        return self._cached_prompt
+
+    def format_issues(self) -> str:
+        """Format just the issues, without the source and time range header."""
+        if self._cached_issues is None:
+            out = StringIO()
+            for i, issue in enumerate(self.issues, 1):
+                if i > 1:
+                    out.write("\n")
+                out.write(f"=== Issue {i} ===\n")
+                issue._write_to(out)
+            self._cached_issues = out.getvalue()
+        return self._cached_issues
+
+    def split(self, max_issues: int) -> list["IssueBatch"]:
+        """Split into batches of at most max_issues issues each."""
+        return [
+            IssueBatch(
+                issues=self.issues[i : i + max_issues],
+                source=self.source,
+                start_time=self.start_time,
+                end_time=self.end_time,
+            )
+            for i in range(0, len(self.issues), max_issues)
         ]
 
-        for i, issue in enumerate(self.issues, 1):
-            parts.append(f"=== Issue {i} ===")
-            parts.append(issue.format_for_analysis())
-            parts.append("")
-
-        return "\n".join(parts)
-
 
 class LogBuffer:
     """Buffer for collecting logs and batching issues."""
@@ -88,22 +137,40 @@ class LogBuffer:
         self.history_minutes = history_minutes
         self.max_history_lines = max_history_lines
 
-        # Rolling context buffer (recent lines for context)
-        self._context_buffer: deque[LogLine] = deque(maxlen=context_lines)
-
-        # Pending issues waiting for context_after
-        self._pending_issues: list[tuple[BufferedIssue, int]] = []  # (issue, lines_needed)
+        # Shared window of recent lines; issues record the absolute index of
+        # their trigger line and slice their context out of it on completion.
+        # _recent_base is the absolute index of _recent[0].
+        self._recent: list[LogLine] = []
+        self._recent_base = 0
+        self._recent_keep = 2 * context_lines + 1  # Enough for any pending issue
+        self._recent_limit = max(1024, 4 * self._recent_keep)
+
+        # Pending issues (with trigger index) waiting for context_after, as a
+        # ring of countdown buckets: the bucket at _pending_head completes on
+        # the next line, the one after it on the line after that, and so on
+        self._pending_buckets: list[list[tuple[BufferedIssue, int]]] = [
+            [] for _ in range(context_lines + 1)
+        ]
+        self._pending_head = 0
+        # Issues in the ring; while it's 0 the ring is left alone entirely
+        self._pending_count = 0
 
         # Current batch of complete issues
         self._current_batch: list[BufferedIssue] = []
-        self._batch_start_time: datetime | None = None
+        self._batch_start_time: float | None = None
+        # Issues in the current batch by template, for coalescing duplicates
+        self._batch_seen: dict[tuple[str, str], BufferedIssue] = {}
 
-        # Full history for queries
+        # Full history for queries, with parallel epoch timestamps (kept in
+        # lockstep, same maxlen) so time-window lookups can bisect
         self._history: deque[LogLine] = deque(maxlen=max_history_lines)
+        self._history_ts: deque[float] = deque(maxlen=max_history_lines)
+        # Sources hand out one shared datetime for lines arriving together, so
+        # the epoch float of the last one is reused while the same object repeats
+        self._last_dt: datetime | None = None
+        self._last_ts = 0.0
         self._issue_history: deque[BufferedIssue] = deque(maxlen=1000)
-
-        # Batch ready callback
-        self._batch_ready_event = asyncio.Event()
+        self._issue_ts: deque[float] = deque(maxlen=1000)
 
     def add_line(
         self,
@@ -113,41 +180,85 @@ class LogBuffer:
         """Add a log line to the buffer."""
         # Add to history
         self._history.append(line)
-
-        # Process pending issues (add context_after)
-        still_pending = []
-        for issue, lines_needed in self._pending_issues:
-            if lines_needed > 0:
-                issue.context_after.append(line)
-                lines_needed -= 1
-            if lines_needed > 0:
-                still_pending.append((issue, lines_needed))
-            else:
-                # Issue is complete, add to batch
-                self._add_to_batch(issue)
-        self._pending_issues = still_pending
+        if line.timestamp is not self._last_dt:
+            self._last_dt = line.timestamp
+            self._last_ts = line.timestamp.timestamp()
+        self._history_ts.append(self._last_ts)
+
+        recent = self._recent
+        index = self._recent_base + len(recent)
+        recent.append(line)
+
+        # Issues in the head bucket now have all their context
+        if self._pending_count:
+            buckets = self._pending_buckets
+            completed = buckets[self._pending_head]
+            if completed:
+                self._pending_count -= len(completed)
+                for issue, trigger in completed:
+                    self._complete_issue(issue, trigger, index + 1)
+                completed.clear()
+            self._pending_head = (self._pending_head + 1) % len(buckets)
 
         # If this line is an issue, create a new buffered issue
         if filter_result.should_analyze:
             issue = BufferedIssue(
                 trigger_line=line,
                 filter_result=filter_result,
-                context_before=list(self._context_buffer),
+                context_before=(),
                 context_after=[],
             )
-            # Queue for context_after collection
-            self._pending_issues.append((issue, self.context_lines))
-
-        # Add to context buffer
-        self._context_buffer.append(line)
+            if self.context_lines == 0:
+                self._complete_issue(issue, index, index + 1)
+            else:
+                # Queue for context_after collection: completes context_lines
+                # lines from now
+                buckets = self._pending_buckets
+                slot = (self._pending_head + self.context_lines - 1) % len(buckets)
+                buckets[slot].append((issue, index))
+                self._pending_count += 1
+
+        # Drop lines no pending issue can reach any more
+        if len(recent) > self._recent_limit:
+            drop = len(recent) - self._recent_keep
+            del recent[:drop]
+            self._recent_base += drop
+
+    def _complete_issue(self, issue: BufferedIssue, trigger: int, end: int) -> None:
+        """Fill in an issue's context from the recent-line window and batch it."""
+        base = self._recent_base
+        start = max(trigger - self.context_lines, base)
+        issue.context_before = self._recent[start - base : trigger - base]
+        issue.context_after = self._recent[trigger + 1 - base : end - base]
+        self._add_to_batch(issue)
 
     def _add_to_batch(self, issue: BufferedIssue) -> None:
         """Add a complete issue to the current batch."""
         if self._batch_start_time is None:
-            self._batch_start_time = datetime.now()
+            self._batch_start_time = time.time()
 
-        self._current_batch.append(issue)
         self._issue_history.append(issue)
+        self._issue_ts.append(issue.ts)
+
+        # Fold near-duplicates (same template) into the first occurrence so
+        # a burst of identical errors costs one issue's worth of tokens
+        template = _DIGITS_RE.sub("#", issue.trigger_line.content.lower())[:160]
+        key = (issue.filter_result.severity, template)
+        existing = self._batch_seen.get(key)
+        if existing is not None:
+            existing.count += 1
+            if not existing.context_after:
+                existing.context_after.extend(issue.context_after)
+            return
+
+        self._batch_seen[key] = issue
+        self._current_batch.append(issue)
+
+    def batch_deadline(self) -> float | None:
+        """Epoch time at which the current batch is due, or None if it's empty."""
+        if self._batch_start_time is None:
+            return None
+        return self._batch_start_time + self.batch_window_seconds
 
     def get_batch_if_ready(self, source: str) -> IssueBatch | None:
         """
@@ -161,69 +272,83 @@ class LogBuffer:
         if self._batch_start_time is None:
             return None
 
-        elapsed = (datetime.now() - self._batch_start_time).total_seconds()
-        if elapsed < self.batch_window_seconds:
+        now = time.time()
+        if now - self._batch_start_time < self.batch_window_seconds:
             return None
 
         # Batch is ready
         batch = IssueBatch(
             issues=self._current_batch,
             source=source,
-            start_time=self._batch_start_time,
-            end_time=datetime.now(),
+            start_time=datetime.fromtimestamp(self._batch_start_time),
+            end_time=datetime.fromtimestamp(now),
         )
 
         # Reset batch state
         self._current_batch = []
         self._batch_start_time = None
+        self._batch_seen = {}
 
         return batch
 
     def force_flush(self, source: str) -> IssueBatch | None:
         """Force flush the current batch regardless of time window."""
         # First, complete any pending issues without waiting for more context
-        for issue, _ in self._pending_issues:
-            self._add_to_batch(issue)
-        self._pending_issues = []
+        end = self._recent_base + len(self._recent)
+        buckets = self._pending_buckets
+        for offset in range(len(buckets)):
+            bucket = buckets[(self._pending_head + offset) % len(buckets)]
+            for issue, trigger in bucket:
+                self._complete_issue(issue, trigger, end)
+            bucket.clear()
+        self._pending_count = 0
 
         if not self._current_batch:
             return None
 
+        now = time.time()
         batch = IssueBatch(
             issues=self._current_batch,
             source=source,
-            start_time=self._batch_start_time or datetime.now(),
-            end_time=datetime.now(),
+            start_time=datetime.fromtimestamp(self._batch_start_time or now),
+            end_time=datetime.fromtimestamp(now),
         )
 
         self._current_batch = []
         self._batch_start_time = None
+        self._batch_seen = {}
 
         return batch
 
     def get_recent_logs(self, minutes: int = 30) -> list[LogLine]:
-        """Get logs from the last N minutes."""
-        cutoff = datetime.now() - timedelta(minutes=minutes)
-        return [line for line in self._history if line.timestamp >= cutoff]
+        """
+        Get logs from the last N minutes.
+
+        History is appended in timestamp order, so the cutoff is found by
+        binary search instead of scanning every line.
+        """
+        cutoff = time.time() - minutes * 60
+        start = bisect.bisect_left(self._history_ts, cutoff)
+        return list(itertools.islice(self._history, start, None))
 
     def get_recent_issues(self, minutes: int = 30) -> list[BufferedIssue]:
         """Get issues from the last N minutes."""
-        cutoff = datetime.now() - timedelta(minutes=minutes)
-        return [issue for issue in self._issue_history if issue.timestamp >= cutoff]
+        cutoff = time.time() - minutes * 60
+        start = bisect.bisect_left(self._issue_ts, cutoff)
+        return list(itertools.islice(self._issue_history, start, None))
 
     def get_summary(self, minutes: int = 30) -> dict:
         """Get a summary of recent activity."""
         recent_logs = self.get_recent_logs(minutes)
         recent_issues = self.get_recent_issues(minutes)
 
-        error_count = sum(1 for i in recent_issues if i.filter_result.severity == "error")
-        warning_count = sum(1 for i in recent_issues if i.filter_result.severity == "warning")
+        severities = Counter(i.filter_result.severity for i in recent_issues)
 
         return {
             "time_range_minutes": minutes,
             "total_log_lines": len(recent_logs),
             "total_issues": len(recent_issues),
-            "error_count": error_count,
-            "warning_count": warning_count,
+            "error_count": severities[SEV_ERROR],
+            "warning_count": severities[SEV_WARNING],
             "issues": recent_issues,
         }
@@ -14,6 +14,7 @@ from .analyzer import LogAnalyzer
 from .watcher import LogWatcher
 from .buffer import LogBuffer
 from .filter import LogFilter
+from .ingest import load_file
 from . import output
 
 
@@ -35,6 +36,14 @@ def version_callback(value: bool) -> None:
         raise typer.Exit()
 
 
+def _use_output_format(output_format: str) -> None:
+    try:
+        output.set_output_format(output_format)
+    except ValueError as e:
+        output.print_error(str(e))
+        raise typer.Exit(1)
+
+
 @app.callback()
 def main(
     version: Annotated[
@@ -76,6 +85,13 @@ def watch(
         str,
         typer.Option("--model", "-m", help="OpenAI model to use"),
     ] = "gpt-4o-mini",
+    cheap_model: Annotated[
+        Optional[str],
+        typer.Option(
+            "--cheap-model",
+            help="Faster model for warning-only batches (errors still use --model)",
+        ),
+    ] = None,
     api_key: Annotated[
         Optional[str],
         typer.Option("--api-key", envvar="OPENAI_API_KEY", help="OpenAI API key"),
@@ -84,9 +100,18 @@ def watch(
         Optional[str],
         typer.Option("--base-url", envvar="OPENAI_BASE_URL", help="Custom API base URL"),
     ] = None,
+    output_format: Annotated[
+        str,
+        typer.Option(
+            "--format",
+            envvar="HAWKEYE_OUTPUT_FORMAT",
+            help="Output format: text, or json for one object per line",
+        ),
+    ] = "text",
 ) -> None:
     """Watch logs from a file, stdin, or Docker container."""
     global _watcher, _buffer
+    _use_output_format(output_format)
 
     # Set up analyzer
     analyzer = None
@@ -97,7 +122,9 @@ def watch(
                 "Use --no-analysis to run without LLM analysis."
             )
             raise typer.Exit(1)
-        analyzer = LogAnalyzer(api_key=api_key, model=model, base_url=base_url)
+        analyzer = LogAnalyzer(
+            api_key=api_key, model=model, base_url=base_url, cheap_model=cheap_model
+        )
 
     # Determine source type
     try:
@@ -147,7 +174,7 @@ def watch(
         asyncio.run(watcher.start())
 
     except KeyboardInterrupt:
-        console.print("\n[dim]Stopped watching.[/dim]")
+        output.print_stopped()
     except Exception as e:
         output.print_error(str(e))
         raise typer.Exit(1)
@@ -171,6 +198,13 @@ def ask(
         str,
         typer.Option("--model", help="OpenAI model to use"),
     ] = "gpt-4o-mini",
+    cheap_model: Annotated[
+        Optional[str],
+        typer.Option(
+            "--cheap-model",
+            help="Faster model for warning-only batches (errors still use --model)",
+        ),
+    ] = None,
     api_key: Annotated[
         Optional[str],
         typer.Option("--api-key", envvar="OPENAI_API_KEY", help="OpenAI API key"),
@@ -179,13 +213,24 @@ def ask(
         Optional[str],
         typer.Option("--base-url", envvar="OPENAI_BASE_URL", help="Custom API base URL"),
     ] = None,
+    output_format: Annotated[
+        str,
+        typer.Option(
+            "--format",
+            envvar="HAWKEYE_OUTPUT_FORMAT",
+            help="Output format: text, or json for one object per line",
+        ),
+    ] = "text",
 ) -> None:
     """Ask a question about recent logs."""
+    _use_output_format(output_format)
     if not api_key:
         output.print_error("OPENAI_API_KEY not set. Use --api-key or set the environment variable.")
         raise typer.Exit(1)
 
-    analyzer = LogAnalyzer(api_key=api_key, model=model, base_url=base_url)
+    analyzer = LogAnalyzer(
+        api_key=api_key, model=model, base_url=base_url, cheap_model=cheap_model
+    )
     buffer = LogBuffer()
     log_filter = LogFilter()
 
@@ -197,22 +242,7 @@ def ask(
             raise typer.Exit(1)
 
         output.print_info(f"Reading {log_file}...")
-
-        # Read the file and populate buffer
-        from .sources.file import FileSource
-        from .sources.base import LogLine
-        from datetime import datetime
-
-        with open(path, "r") as f:
-            for line in f:
-                line = line.rstrip("\n")
-                log_line = LogLine(
-                    content=line,
-                    timestamp=datetime.now(),
-                    source=str(path),
-                )
-                result = log_filter.check(line)
-                buffer.add_line(log_line, result)
+        load_file(path, buffer, log_filter)
 
     # If we have an active watcher, use its buffer
     elif _buffer is not None:
@@ -243,6 +273,104 @@ def ask(
         raise typer.Exit(1)
 
 
+@app.command()
+def analyze(
+    log_file: Annotated[
+        str,
+        typer.Option("--file", "-f", help="Log file to analyze"),
+    ],
+    batch: Annotated[
+        bool,
+        typer.Option(
+            "--batch",
+            help="Submit through the OpenAI Batch API (cheaper, may take hours)",
+        ),
+    ] = False,
+    issues_per_batch: Annotated[
+        int,
+        typer.Option("--issues-per-batch", help="Maximum issues per analysis request"),
+    ] = 20,
+    model: Annotated[
+        str,
+        typer.Option("--model", help="OpenAI model to use"),
+    ] = "gpt-4o-mini",
+    cheap_model: Annotated[
+        Optional[str],
+        typer.Option(
+            "--cheap-model",
+            help="Faster model for warning-only batches (errors still use --model)",
+        ),
+    ] = None,
+    api_key: Annotated[
+        Optional[str],
+        typer.Option("--api-key", envvar="OPENAI_API_KEY", help="OpenAI API key"),
+    ] = None,
+    base_url: Annotated[
+        Optional[str],
+        typer.Option("--base-url", envvar="OPENAI_BASE_URL", help="Custom API base URL"),
+    ] = None,
+    output_format: Annotated[
+        str,
+        typer.Option(
+            "--format",
+            envvar="HAWKEYE_OUTPUT_FORMAT",
+            help="Output format: text, or json for one object per line",
+        ),
+    ] = "text",
+) -> None:
+    """Analyze all issues in a log file."""
+    _use_output_format(output_format)
+    if not api_key:
+        output.print_error("OPENAI_API_KEY not set. Use --api-key or set the environment variable.")
+        raise typer.Exit(1)
+
+    path = Path(log_file)
+    if not path.exists():
+        output.print_error(f"File not found: {log_file}")
+        raise typer.Exit(1)
+
+    analyzer = LogAnalyzer(
+        api_key=api_key, model=model, base_url=base_url, cheap_model=cheap_model
+    )
+    buffer = LogBuffer()
+    log_filter = LogFilter()
+
+    output.print_info(f"Reading {log_file}...")
+    load_file(path, buffer, log_filter)
+
+    all_issues = buffer.force_flush(str(path))
+    if all_issues is None:
+        output.print_info("No issues detected.")
+        return
+    batches = all_issues.split(max(1, issues_per_batch))
+
+    async def do_analysis():
+        if batch:
+            batch_id = await analyzer.submit_batch(batches)
+            output.print_info(
+                f"Submitted batch {batch_id} ({len(batches)} requests). Waiting for results..."
+            )
+            results, failed = await analyzer.wait_for_batch(batch_id)
+        else:
+            results = await asyncio.gather(*(analyzer.analyze_batch(b) for b in batches))
+            failed = 0
+
+        for result in results:
+            output.print_analysis(result)
+
+        if failed:
+            output.print_error(
+                f"{failed} of {len(batches)} batch requests failed; "
+                f"showing {len(results)} analyses."
+            )
+
+    try:
+        asyncio.run(do_analysis())
+    except Exception as e:
+        output.print_error(str(e))
+        raise typer.Exit(1)
+
+
 @app.command()
 def status(
     minutes: Annotated[
@@ -253,8 +381,17 @@ def status(
         Optional[str],
         typer.Option("--file", "-f", help="Log file to analyze"),
     ] = None,
+    output_format: Annotated[
+        str,
+        typer.Option(
+            "--format",
+            envvar="HAWKEYE_OUTPUT_FORMAT",
+            help="Output format: text, or json for one object per line",
+        ),
+    ] = "text",
 ) -> None:
     """Show status summary of recent log activity."""
+    _use_output_format(output_format)
     buffer = LogBuffer()
     log_filter = LogFilter()
 
@@ -265,19 +402,7 @@ def status(
             output.print_error(f"File not found: {log_file}")
             raise typer.Exit(1)
 
-        from .sources.base import LogLine
-        from datetime import datetime
-
-        with open(path, "r") as f:
-            for line in f:
-                line = line.rstrip("\n")
-                log_line = LogLine(
-                    content=line,
-                    timestamp=datetime.now(),
-                    source=str(path),
-                )
-                result = log_filter.check(line)
-                buffer.add_line(log_line, result)
+        load_file(path, buffer, log_filter)
 
     elif _buffer is not None:
         buffer = _buffer
@@ -1,8 +1,16 @@
 """Pre-filter for detecting potential issues in logs before sending to LLM."""
 
+import functools
 import re
+import sys
+from collections import OrderedDict
 from dataclasses import dataclass, field
 
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
+
 
 @dataclass
 class FilterConfig:
@@ -72,7 +80,14 @@ class FilterConfig:
     min_severity: str = "warning"
 
 
-@dataclass
+# Severity levels, interned so every result shares the same string objects
+SEV_ERROR = sys.intern("error")
+SEV_WARNING = sys.intern("warning")
+SEV_INFO = sys.intern("info")
+SEV_IGNORE = sys.intern("ignore")
+
+
+@dataclass(frozen=True, slots=True)
 class FilterResult:
     """Result of filtering a log line."""
 
@@ -81,13 +96,141 @@ class FilterResult:
     matched_pattern: str | None = None
 
 
+# Shared results for lines that need no analysis (the common case)
+_INFO_RESULT = FilterResult(should_analyze=False, severity=SEV_INFO)
+_IGNORE_RESULT = FilterResult(should_analyze=False, severity=SEV_IGNORE)
+
+
+def _word_body(pattern: str) -> str | None:
+    """Return the body of a \\b...\\b pattern, or None if it isn't one to share \\b with."""
+    if len(pattern) <= 4 or not (pattern.startswith(r"\b") and pattern.endswith(r"\b")):
+        return None
+    body = pattern[2:-2]
+    depth = 0
+    class_start = -1  # Index of the open [ while inside a character class
+    escaped = False
+    for i, ch in enumerate(body):
+        if escaped:
+            escaped = False
+        elif ch == "\\":
+            escaped = True
+        elif class_start >= 0:
+            # A ] right after [ or [^ is a literal, not the end of the class
+            if ch == "]" and body[class_start + 1 : i] not in ("", "^"):
+                class_start = -1
+        elif ch == "[":
+            class_start = i
+        elif ch == "(":
+            depth += 1
+        elif ch == ")":
+            depth -= 1
+        elif ch == "|" and depth == 0:
+            return None  # \ba|b\b is (\ba)|(b\b), not \b(a|b)\b
+    if escaped or class_start >= 0 or depth:
+        return None  # Ends in \\b (a literal backslash), or malformed
+    return body
+
+
+def _compile_alternation(patterns: list[str]) -> re.Pattern | None:
+    """
+    Compile patterns into one case-insensitive regex matching wherever any does.
+
+    Alternatives are non-capturing, and patterns of the form \\b...\\b share a
+    single \\b(?:...)\\b group, so re tests the word boundary once per position
+    instead of once per pattern.
+    """
+    if not patterns:
+        return None
+    words = []
+    others = []
+    for p in patterns:
+        body = _word_body(p)
+        if body is None:
+            others.append(f"(?:{p})")
+        else:
+            words.append(body)
+    if words:
+        others.insert(0, r"\b(?:" + "|".join(words) + r")\b")
+    return re.compile("|".join(others), re.IGNORECASE)
+
+
+# Volatile tokens (hex values, ids, ports, timestamps) collapsed in template keys.
+# Digit runs are collapsed to a run of 4 digits, except short runs that some
+# pattern matches on their own (like 404 for \b404\b), which are kept as is.
+# Collapsing a run never changes word boundaries, so bounded short literals
+# keep matching the same way.
+_HEX_RE = re.compile(r"0[xX][0-9a-fA-F]+\b")
+_DIGIT_RE = re.compile(r"\d")
+_TEMPLATE_NUMBER = "0000"
+_SHORT_DIGIT_RUNS = [
+    f"{n:0{width}d}" for width in (1, 2, 3) for n in range(10**width)
+]
+
+# Patterns that could match inside long digit runs, or on hex values, make
+# template keys unsafe
+_DIGIT_SENSITIVE_RE = re.compile(r"\\d|\d{4}|\[[^\]]*0-9[^\]]*\][*+{]|0[xX]")
+
+EXACT_CACHE_SIZE = 4096
+TEMPLATE_CACHE_SIZE = 4096
+
+
+def _template_number_re(patterns: list[re.Pattern]) -> re.Pattern | None:
+    """
+    Compile the regex for digit runs a template key collapses.
+
+    Returns None when a pattern would match the collapsed run itself, in
+    which case template keys can't be used.
+    """
+    digit_patterns = [p for p in patterns if _DIGIT_RE.search(p.pattern)]
+    if any(p.search(f" {_TEMPLATE_NUMBER} ") for p in digit_patterns):
+        return None
+    kept = {
+        run for run in _SHORT_DIGIT_RUNS if any(p.search(f" {run} ") for p in digit_patterns)
+    }
+    if not kept:
+        return re.compile(r"\d+")
+    return re.compile(r"(?<!\d)(?!(?:" + "|".join(sorted(kept)) + r")(?!\d))\d+")
+
+
 class LogFilter:
-    """Filter log lines to detect potential issues."""
+    """
+    Filter log lines to detect potential issues.
+
+    check(line) -> FilterResult is the entry point: it reports whether a line
+    should be analyzed and at what severity. It is an instance attribute set
+    in __init__, bound directly to the result cache so a cache hit (the
+    steady-state case) runs no Python bytecode; results are cached per exact
+    line and per line template, since real logs repeat a small number of
+    templates. Subclasses customize matching by overriding _check_uncached.
+
+    Ignore patterns win over error patterns, which win over warning
+    patterns; within a category the first pattern in list order that
+    matches is reported, whichever engine (Hyperscan or re) ran.
+    """
 
     def __init__(self, config: FilterConfig | None = None):
         self.config = config or FilterConfig()
         self._compile_patterns()
 
+        # Two-level result cache: exact line, then normalized line template.
+        # A Hyperscan scan costs less than building a template key, so with
+        # Hyperscan only the exact-line level is used
+        self._template_cache: OrderedDict[str, FilterResult] = OrderedDict()
+        self._cached_check = functools.lru_cache(maxsize=EXACT_CACHE_SIZE)(
+            self._check_template if self._hs_db is None else self._check_uncached
+        )
+
+        # check() is the C-implemented cache wrapper itself (see class docstring)
+        self.check = self._cached_check
+
+    def __getstate__(self) -> dict:
+        # Compiled patterns, caches and the Hyperscan database don't pickle;
+        # ship the config and rebuild them on the other side
+        return {"config": self.config}
+
+    def __setstate__(self, state: dict) -> None:
+        self.__init__(state["config"])
+
     def _compile_patterns(self) -> None:
         """Compile regex patterns for efficiency."""
         self._error_patterns = [
@@ -100,16 +243,149 @@ class LogFilter:
             re.compile(p, re.IGNORECASE) for p in self.config.ignore_patterns
         ]
 
-    def check(self, line: str) -> FilterResult:
+        # One prefilter over every pattern rejects the common no-match line
+        # in a single regex call; only lines it matches run the pattern loop
+        self._any_re = _compile_alternation(
+            self.config.ignore_patterns
+            + self.config.error_patterns
+            + self.config.warning_patterns
+        )
+
+        self._stack_re = re.compile(
+            r"^(?:"
+            r"\s+at\s+"  # Java/JS stack trace
+            r"|\s+File\s+\""  # Python stack trace
+            r"|\s+\d+:\s+0x"  # Go stack trace
+            r"|\s+\w+\.\w+\("  # Generic method call
+            r"|\s+in\s+\w+\s+at\s+"  # C#/.NET
+            r")"
+        )
+
+        self._hs_db = self._compile_hyperscan()
+
+        # Template keys (None when the patterns make them unsafe)
+        all_patterns = self._ignore_patterns + self._error_patterns + self._warning_patterns
+        self._template_number_re = None
+        if not any(_DIGIT_SENSITIVE_RE.search(p.pattern) for p in all_patterns):
+            self._template_number_re = _template_number_re(all_patterns)
+
+    def _compile_hyperscan(self):
         """
-        Check if a log line indicates a potential issue.
+        Compile all patterns into a single Hyperscan database, if available.
 
-        Returns FilterResult with severity and whether it should be analyzed.
+        Pattern IDs follow check priority (ignore, error, warning), so for
+        ASCII lines the lowest matching ID is the result the regex loop would
+        return. Hyperscan's \\b, \\w and \\s are ASCII-only while re's are
+        Unicode-aware, so other lines are left to the re path (see
+        _check_uncached). Returns None when Hyperscan is missing or rejects
+        a pattern.
         """
+        if hyperscan is None:
+            return None
+
+        self._hs_patterns = (
+            self._ignore_patterns + self._error_patterns + self._warning_patterns
+        )
+        if not self._hs_patterns:
+            return None
+
+        flags = (
+            hyperscan.HS_FLAG_CASELESS
+            | hyperscan.HS_FLAG_SINGLEMATCH
+            | hyperscan.HS_FLAG_ALLOWEMPTY
+        )
+        db = hyperscan.Database(mode=hyperscan.HS_MODE_BLOCK)
+        try:
+            db.compile(
+                expressions=[p.pattern.encode() for p in self._hs_patterns],
+                ids=list(range(len(self._hs_patterns))),
+                elements=len(self._hs_patterns),
+                flags=[flags] * len(self._hs_patterns),
+            )
+        except hyperscan.error:
+            return None
+        return db
+
+    def _on_hs_match(self, pattern_id, start, end, flags, hits) -> bool:
+        """Record a Hyperscan match; stop scanning once an ignore pattern hits."""
+        hits.append(pattern_id)
+        return pattern_id < len(self._ignore_patterns)
+
+    def _check_hyperscan(self, line: str) -> FilterResult:
+        """Check a line with a single Hyperscan pass over all patterns."""
+        hits: list[int] = []
+        try:
+            self._hs_db.scan(
+                line.encode(errors="replace"),
+                match_event_handler=self._on_hs_match,
+                context=hits,
+            )
+        except hyperscan.ScanTerminated:
+            pass
+
+        num_ignore = len(self._ignore_patterns)
+        num_checked = num_ignore + len(self._error_patterns)
+        if self.config.min_severity in ("warning", "info"):
+            num_checked += len(self._warning_patterns)
+
+        hits = [h for h in hits if h < num_checked]
+        if not hits:
+            return _INFO_RESULT
+
+        best = min(hits)
+        if best < num_ignore:
+            return _IGNORE_RESULT
+
+        # Hyperscan only reports offsets, so recover the matched text with re
+        match = self._hs_patterns[best].search(line)
+        if match is None:
+            # The engines disagree on this line; re's answer is the reference
+            return self._check_regex(line)
+        return FilterResult(
+            should_analyze=True,
+            severity=SEV_ERROR if best < num_ignore + len(self._error_patterns) else SEV_WARNING,
+            matched_pattern=match.group(),
+        )
+
+    def check_many(self, lines: list[str]) -> list[FilterResult]:
+        """Check a chunk of lines in one call (see check)."""
+        return list(map(self._cached_check, lines))
+
+    def _check_template(self, line: str) -> FilterResult:
+        """Check a line, reusing the result of an earlier line with the same template."""
+        if self._template_number_re is None:
+            return self._check_uncached(line)
+
+        # Collapse hex values and digit runs no pattern looks at
+        key = self._template_number_re.sub(_TEMPLATE_NUMBER, _HEX_RE.sub("0x0", line))
+        result = self._template_cache.get(key)
+        if result is not None:
+            self._template_cache.move_to_end(key)
+            return result
+
+        result = self._check_uncached(line)
+        self._template_cache[key] = result
+        if len(self._template_cache) > TEMPLATE_CACHE_SIZE:
+            self._template_cache.popitem(last=False)
+        return result
+
+    def _check_uncached(self, line: str) -> FilterResult:
+        """Run the pattern match for a line, bypassing the caches."""
+        # Hyperscan matches bytes with ASCII character classes; only ASCII
+        # lines are guaranteed to get the same answer as re
+        if self._hs_db is not None and line.isascii():
+            return self._check_hyperscan(line)
+        return self._check_regex(line)
+
+    def _check_regex(self, line: str) -> FilterResult:
+        """Match a line against the prefilter, then each pattern in turn."""
+        if self._any_re is None or self._any_re.search(line) is None:
+            return _INFO_RESULT
+
         # Check ignore patterns first
         for pattern in self._ignore_patterns:
             if pattern.search(line):
-                return FilterResult(should_analyze=False, severity="ignore")
+                return _IGNORE_RESULT
 
         # Check error patterns
         for pattern in self._error_patterns:
@@ -117,7 +393,7 @@ class LogFilter:
             if match:
                 return FilterResult(
                     should_analyze=True,
-                    severity="error",
+                    severity=SEV_ERROR,
                     matched_pattern=match.group(),
                 )
 
@@ -128,20 +404,13 @@ class LogFilter:
                 if match:
                     return FilterResult(
                         should_analyze=True,
-                        severity="warning",
+                        severity=SEV_WARNING,
                         matched_pattern=match.group(),
                     )
 
         # No issues detected
-        return FilterResult(should_analyze=False, severity="info")
+        return _INFO_RESULT
 
     def is_stack_trace_line(self, line: str) -> bool:
         """Check if a line looks like part of a stack trace."""
-        stack_patterns = [
-            r"^\s+at\s+",  # Java/JS stack trace
-            r"^\s+File\s+\"",  # Python stack trace
-            r"^\s+\d+:\s+0x",  # Go stack trace
-            r"^\s+\w+\.\w+\(",  # Generic method call
-            r"^\s+in\s+\w+\s+at\s+",  # C#/.NET
-        ]
-        return any(re.match(p, line) for p in stack_patterns)
+        return self._stack_re.match(line) is not None
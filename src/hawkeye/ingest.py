@@ -0,0 +1,179 @@
+"""Bulk ingestion of log files for one-shot commands (ask, status, analyze)."""
+
+import mmap
+import os
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+from .buffer import LogBuffer
+from .filter import SEV_INFO, FilterResult, LogFilter
+from .sources.base import LogLine
+
+
+# Bytes per chunk; each chunk is extended to the next newline
+CHUNK_SIZE = 1 << 20
+
+# Files smaller than this are filtered in-process; pool startup would dominate
+PARALLEL_THRESHOLD = 64 << 20
+
+# Filter used by worker processes, set by _init_worker
+_worker_filter: LogFilter | None = None
+
+
+def _split_chunk(data: bytes) -> list[str]:
+    """Decode a chunk of whole lines and split it into lines."""
+    lines = data.decode("utf-8", errors="replace").replace("\r\n", "\n").split("\n")
+    if lines[-1] == "":
+        lines.pop()
+    return lines
+
+
+def _iter_stream_chunks(f, chunk_size: int) -> Iterator[list[str]]:
+    """Chunk a file that cannot be memory-mapped (pipes, process substitution)."""
+    tail = b""
+    while data := f.read(chunk_size):
+        data = tail + data
+        last_newline = data.rfind(b"\n")
+        if last_newline == -1:
+            tail = data
+            continue
+        tail = data[last_newline + 1 :]
+        yield _split_chunk(data[: last_newline + 1])
+    if tail:
+        yield _split_chunk(tail)
+
+
+def _iter_mmap_chunks(
+    mm: mmap.mmap, start: int, end: int, chunk_size: int = CHUNK_SIZE
+) -> Iterator[list[str]]:
+    """Chunk the lines in mm[start:end], cutting each chunk at a newline."""
+    while start < end:
+        stop = end
+        if start + chunk_size < end:
+            newline = mm.find(b"\n", start + chunk_size, end)
+            if newline != -1:
+                stop = newline + 1
+        yield _split_chunk(mm[start:stop])
+        start = stop
+
+
+def _split_ranges(mm: mmap.mmap, parts: int) -> list[tuple[int, int]]:
+    """Split a mapped file into up to `parts` byte ranges of whole lines."""
+    size = len(mm)
+    bounds = [0]
+    for k in range(1, parts):
+        newline = mm.find(b"\n", max(k * size // parts, bounds[-1]))
+        if newline == -1:
+            break
+        bounds.append(newline + 1)
+    bounds.append(size)
+    return [(start, end) for start, end in zip(bounds, bounds[1:]) if start < end]
+
+
+def iter_line_chunks(path: Path, chunk_size: int = CHUNK_SIZE) -> Iterator[list[str]]:
+    """
+    Yield the lines of a file in chunks of roughly chunk_size bytes.
+
+    The file is memory-mapped and cut at newlines, so each chunk is decoded
+    and split in one call instead of reading line by line.
+    """
+    with open(path, "rb") as f:
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            return  # Empty file
+        except OSError:
+            yield from _iter_stream_chunks(f, chunk_size)
+            return
+
+        with mm:
+            yield from _iter_mmap_chunks(mm, 0, len(mm), chunk_size)
+
+
+def _init_worker(log_filter: LogFilter) -> None:
+    """Install the filter in a worker process."""
+    global _worker_filter
+    _worker_filter = log_filter
+
+
+def _filter_range(path: str, start: int, end: int) -> list[tuple[int, FilterResult]]:
+    """
+    Filter the lines in a byte range of a file (runs in a worker process).
+
+    Returns (line index within the range, result) for every line that isn't
+    plain info, which keeps the results sent back to the parent small.
+    """
+    hits = []
+    index = 0
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        for lines in _iter_mmap_chunks(mm, start, end):
+            for result in _worker_filter.check_many(lines):
+                if result.severity != SEV_INFO:
+                    hits.append((index, result))
+                index += 1
+    return hits
+
+
+def _load_file_parallel(
+    path: Path,
+    mm: mmap.mmap,
+    buffer: LogBuffer,
+    log_filter: LogFilter,
+    workers: int,
+) -> None:
+    """Filter byte ranges of a mapped file in worker processes, then buffer in order."""
+    source = str(path)
+    info = FilterResult(should_analyze=False, severity=SEV_INFO)
+    ranges = _split_ranges(mm, workers)
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(log_filter,),
+    ) as pool:
+        futures = [pool.submit(_filter_range, source, start, end) for start, end in ranges]
+
+        # Context depends on line order, so merge ranges back in file order
+        for (start, end), future in zip(ranges, futures):
+            hits = dict(future.result())
+            index = 0
+            for lines in _iter_mmap_chunks(mm, start, end):
+                now = datetime.now()
+                for content in lines:
+                    log_line = LogLine(content=content, timestamp=now, source=source)
+                    buffer.add_line(log_line, hits.get(index, info))
+                    index += 1
+
+
+def load_file(
+    path: Path,
+    buffer: LogBuffer,
+    log_filter: LogFilter,
+    workers: int | None = None,
+) -> None:
+    """
+    Read a log file and populate the buffer.
+
+    Large files are filtered in parallel across `workers` processes
+    (default: one per CPU); smaller ones are filtered in-process.
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers > 1 and path.is_file() and path.stat().st_size >= PARALLEL_THRESHOLD:
+        with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            _load_file_parallel(path, mm, buffer, log_filter, workers)
+        return
+
+    source = str(path)
+    for lines in iter_line_chunks(path):
+        # One timestamp per chunk: the whole file is read "now" anyway
+        now = datetime.now()
+        results = log_filter.check_many(lines)
+        for content, result in zip(lines, results):
+            log_line = LogLine(
+                content=content,
+                timestamp=now,
+                source=source,
+            )
+            buffer.add_line(log_line, result)
@@ -0,0 +1,23 @@
+"""JSON encoding and decoding, using orjson when it is installed."""
+
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+if orjson is not None:
+    loads = orjson.loads
+    dumps_bytes = orjson.dumps
+
+    def dumps(obj) -> str:
+        return orjson.dumps(obj).decode()
+
+else:
+    loads = json.loads
+    dumps = json.dumps
+
+    def dumps_bytes(obj) -> bytes:
+        return json.dumps(obj).encode()
@@ -1,16 +1,61 @@
 """Terminal output and alerts using rich."""
 
-from rich.console import Console
+import os
+import queue
+import sys
+import threading
+
+from rich.console import Console, Group
+from rich.padding import Padding
 from rich.panel import Panel
+from rich.style import Style
 from rich.table import Table
 from rich.text import Text
 from rich import box
 
+from . import jsonutil
 from .analyzer import AnalysisResult, QueryResult
 from .buffer import IssueBatch
 
 
-console = Console()
+# Everything is printed as Text with explicit styles, so log content is never
+# parsed for markup, emoji codes or highlighting
+console = Console(markup=False, highlight=False, emoji=False)
+
+# "json" writes one JSON object per event to stdout instead of rendering
+# anything, for log shippers; set with --format or HAWKEYE_OUTPUT_FORMAT
+OUTPUT_FORMAT = os.environ.get("HAWKEYE_OUTPUT_FORMAT", "text")
+
+# When output is piped or redirected there is no styling to render, so log
+# lines, issues and analyses are written to the stream as plain text
+RAW_OUTPUT = not console.is_terminal
+
+
+def _log_buffer_size(default: int = 8000) -> int:
+    """Read HAWKEYE_LOG_BUFFER_SIZE, falling back to the default if it isn't valid."""
+    try:
+        size = int(os.environ.get("HAWKEYE_LOG_BUFFER_SIZE", default))
+    except ValueError:
+        return default
+    return size if size >= 0 else default
+
+
+# Streamed log lines are rendered by a background thread so stdout writes
+# never stall the event loop; 0 renders them synchronously instead
+LOG_BUFFER_SIZE = _log_buffer_size()
+
+# The writer renders whatever has queued up (up to LOG_BATCH_LINES) in one
+# console.print; HAWKEYE_LOG_BUFFER_BATCHED=0 prints them one at a time
+LOG_BUFFER_BATCHED = os.environ.get("HAWKEYE_LOG_BUFFER_BATCHED", "1") != "0"
+LOG_BATCH_LINES = 256
+
+_STOP = object()
+_log_queue: queue.Queue | None = None
+_log_thread: threading.Thread | None = None
+_dropped_lines = 0
+# Set if the writer thread failed to write (e.g. stdout's pipe closed); from
+# then on it discards what's queued and lines are printed synchronously
+_writer_error: Exception | None = None
 
 
 SEVERITY_STYLES = {
@@ -30,44 +75,240 @@ HEALTH_STYLES = {
     "unknown": ("dim", "UNKNOWN"),
 }
 
+# Styles parsed once, so rendering doesn't resolve style strings per event
+_SEVERITY_STYLE_OBJS = {
+    severity: (Style.parse(style), prefix) for severity, (style, prefix) in SEVERITY_STYLES.items()
+}
+_DEFAULT_ISSUE_STYLE = (Style.parse("yellow"), "[!]")
+
+# Streamed log lines: errors and warnings get their prefix, the rest are dim
+_DIM_LINE = (Style.parse("dim"), "")
+_LOG_LINE_STYLES = {
+    severity: (_SEVERITY_STYLE_OBJS[severity][0], _SEVERITY_STYLE_OBJS[severity][1] + " ")
+    for severity in ("error", "warning")
+}
+
+
+def set_output_format(output_format: str) -> None:
+    """Select "text" (rendered) or "json" (one object per line) output."""
+    global OUTPUT_FORMAT
+    if output_format not in ("text", "json"):
+        raise ValueError(f"Unknown output format: {output_format}")
+    OUTPUT_FORMAT = output_format
+
+
+def _emit_json(*events: dict) -> None:
+    """Write events as JSON lines straight to stdout's binary buffer."""
+    out = sys.stdout.buffer
+    out.write(b"".join(jsonutil.dumps_bytes(event) + b"\n" for event in events))
+    out.flush()  # Once per event or batch of log lines, so shippers see them live
+
 
 def print_startup(source: str) -> None:
     """Print startup message."""
-    console.print()
-    console.print(
-        Panel(
-            f"[bold cyan]Hawkeye[/bold cyan] is watching [green]{source}[/green]\n"
-            "[dim]Press Ctrl+C to stop[/dim]",
-            box=box.ROUNDED,
-            border_style="cyan",
-        )
+    if OUTPUT_FORMAT == "json":
+        _emit_json({"event": "startup", "source": source})
+        return
+
+    panel = Panel(
+        Text.assemble(
+            ("Hawkeye", "bold cyan"),
+            " is watching ",
+            (source, "green"),
+            "\n",
+            ("Press Ctrl+C to stop", "dim"),
+        ),
+        box=box.ROUNDED,
+        border_style="cyan",
+    )
+    console.print(Padding(panel, (1, 0)))
+
+
+def start_log_writer() -> None:
+    """Start the background thread that renders streamed log lines."""
+    global _log_queue, _log_thread, _writer_error
+    if _log_thread is not None or LOG_BUFFER_SIZE <= 0:
+        return
+
+    _writer_error = None
+    _log_queue = queue.Queue(maxsize=LOG_BUFFER_SIZE)
+    _log_thread = threading.Thread(
+        target=_drain_log_queue, args=(_log_queue,), name="hawkeye-output", daemon=True
     )
-    console.print()
+    _log_thread.start()
+
+
+def stop_log_writer() -> None:
+    """Render any queued log lines and stop the background thread."""
+    global _log_queue, _log_thread
+    if _log_thread is None:
+        return
+
+    # Never block shutdown on a writer that is gone
+    while _log_thread.is_alive():
+        try:
+            _log_queue.put(_STOP, timeout=0.1)
+            break
+        except queue.Full:
+            continue
+    _log_thread.join()
+    _log_queue = _log_thread = None
+    _report_dropped()
+    if RAW_OUTPUT:
+        console.file.flush()
+
+
+def _drain_log_queue(log_queue: queue.Queue) -> None:
+    """Writer thread: render queued lines until told to stop."""
+    global _writer_error
+    while True:
+        items = [log_queue.get()]
+        if LOG_BUFFER_BATCHED:
+            while len(items) < LOG_BATCH_LINES and items[-1] is not _STOP:
+                try:
+                    items.append(log_queue.get_nowait())
+                except queue.Empty:
+                    break
+
+        stop = items[-1] is _STOP
+        lines = items[:-1] if stop else items
+        try:
+            if lines and _writer_error is None:
+                _render_log_lines(lines)
+        except Exception as e:
+            # Keep consuming (and discarding) so nothing waiting on the queue
+            # hangs; print_log_line switches to synchronous output, which
+            # raises the same error on the main thread
+            _writer_error = e
+        finally:
+            for _ in items:
+                log_queue.task_done()
+        if stop:
+            return
+
+
+def _flush_log_lines() -> None:
+    """Wait for queued log lines, so they print before what comes next."""
+    log_queue, thread = _log_queue, _log_thread
+    if log_queue is not None:
+        # Like log_queue.join(), but gives up if the writer thread has died
+        with log_queue.all_tasks_done:
+            while log_queue.unfinished_tasks and thread.is_alive():
+                log_queue.all_tasks_done.wait(0.1)
+    _report_dropped()
+
+
+def _report_dropped() -> None:
+    """Note how many log lines were dropped since the last report."""
+    global _dropped_lines
+    if _dropped_lines and OUTPUT_FORMAT == "json":
+        _emit_json({"event": "dropped", "count": _dropped_lines})
+        _dropped_lines = 0
+    elif _dropped_lines:
+        console.print(
+            Text(f"({_dropped_lines} log lines not shown, output fell behind)", style="dim")
+        )
+        _dropped_lines = 0
 
 
 def print_log_line(line: str, severity: str = "info") -> None:
     """Print a log line with appropriate styling."""
-    style, prefix = SEVERITY_STYLES.get(severity, ("dim", ""))
-    if severity in ("error", "warning"):
-        console.print(f"{prefix} {line}", style=style)
-    else:
-        console.print(f"[dim]{line}[/dim]")
+    global _dropped_lines
+    if _log_queue is None or _writer_error is not None:
+        _render_log_line(line, severity)
+        return
+
+    try:
+        _log_queue.put_nowait((line, severity))
+    except queue.Full:
+        # Never block ingestion on the terminal; drop the line and say so later
+        _dropped_lines += 1
+
+
+def _render_log_line(line: str, severity: str) -> None:
+    _render_log_lines([(line, severity)])
+
+
+def _render_log_lines(lines: list[tuple[str, str]]) -> None:
+    """
+    Render log lines in one print, one span per run of a severity.
+
+    Lines are plain Text, so brackets in log content aren't read as markup.
+    """
+    if OUTPUT_FORMAT == "json":
+        _emit_json(
+            *({"event": "log", "severity": severity, "line": line} for line, severity in lines)
+        )
+        return
+
+    if RAW_OUTPUT:
+        # Left to the stream's own block buffering, no flush per batch
+        console.file.write(
+            "".join(
+                f"{_LOG_LINE_STYLES.get(severity, _DIM_LINE)[1]}{line}\n"
+                for line, severity in lines
+            )
+        )
+        return
+
+    parts = []
+    run: list[str] = []
+    run_style = None
+    for line, severity in lines:
+        style, prefix = _LOG_LINE_STYLES.get(severity, _DIM_LINE)
+        if prefix:
+            line = prefix + line
+        if style is not run_style and run:
+            parts.append(("\n".join(run) + "\n", run_style))
+            run = []
+        run_style = style
+        run.append(line)
+    parts.append(("\n".join(run), run_style))
+
+    console.print(Text.assemble(*parts))
 
 
 def print_issue_detected(line: str, severity: str, pattern: str | None) -> None:
     """Print when an issue is detected."""
-    style, prefix = SEVERITY_STYLES.get(severity, ("yellow", "[!]"))
-    console.print(f"\n{prefix} Issue detected", style=style)
-    console.print(f"  {line}")
+    _flush_log_lines()
+    if OUTPUT_FORMAT == "json":
+        _emit_json({"event": "issue", "severity": severity, "line": line, "pattern": pattern})
+        return
+
+    style, prefix = _SEVERITY_STYLE_OBJS.get(severity, _DEFAULT_ISSUE_STYLE)
+    if RAW_OUTPUT:
+        matched = f"  Matched: {pattern}\n" if pattern else ""
+        console.file.write(f"\n{prefix} Issue detected\n  {line}\n{matched}")
+        console.file.flush()  # Alerts go out now, not when the block buffer fills
+        return
+
+    parts = [Text(f"\n{prefix} Issue detected", style=style), Text(f"  {line}")]
     if pattern:
-        console.print(f"  [dim]Matched: {pattern}[/dim]")
+        parts.append(Text(f"  Matched: {pattern}", style="dim"))
+    console.print(Group(*parts))
 
 
 def print_analysis(result: AnalysisResult) -> None:
     """Print analysis results."""
+    _flush_log_lines()
+    if OUTPUT_FORMAT == "json":
+        _emit_json(
+            {
+                "event": "analysis",
+                "summary": result.summary,
+                "severity": result.severity,
+                "root_cause": result.root_cause,
+                "suggested_actions": result.suggested_actions,
+                "affected_components": result.affected_components,
+            }
+        )
+        return
+
     style, prefix = SEVERITY_STYLES.get(result.severity, ("yellow", "[!]"))
+    if RAW_OUTPUT:
+        _write_raw_analysis(result, prefix)
+        return
 
-    console.print()
     panel_content = Text()
     panel_content.append(f"{prefix} ", style=style)
     panel_content.append(result.summary)
@@ -85,45 +326,74 @@ def print_analysis(result: AnalysisResult) -> None:
         for action in result.suggested_actions:
             panel_content.append(f"\n  - {action}")
 
-    console.print(
-        Panel(
-            panel_content,
-            title="[bold]Analysis[/bold]",
-            border_style=style.split()[-1] if " " in style else style,
-            box=box.ROUNDED,
-        )
+    panel = Panel(
+        panel_content,
+        title=Text("Analysis", style="bold"),
+        border_style=style.split()[-1] if " " in style else style,
+        box=box.ROUNDED,
     )
-    console.print()
+    console.print(Padding(panel, (1, 0)))
+
+
+def _write_raw_analysis(result: AnalysisResult, prefix: str) -> None:
+    """Write an analysis as a compact plain-text block."""
+    out = [f"\n=== Analysis ===\n{prefix} {result.summary}\n"]
+    if result.root_cause:
+        out.append(f"Root cause: {result.root_cause}\n")
+    if result.affected_components:
+        out.append(f"Affected: {', '.join(result.affected_components)}\n")
+    if result.suggested_actions:
+        out.append("Suggested actions:\n")
+        out.extend(f"  - {action}\n" for action in result.suggested_actions)
+    out.append("\n")
+    console.file.write("".join(out))
+    console.file.flush()
 
 
 def print_query_result(result: QueryResult) -> None:
     """Print query response."""
+    if OUTPUT_FORMAT == "json":
+        _emit_json(
+            {
+                "event": "query",
+                "answer": result.answer,
+                "health_status": result.health_status,
+                "issues_found": result.issues_found,
+                "recommendations": result.recommendations,
+            }
+        )
+        return
+
     health_style, health_text = HEALTH_STYLES.get(
         result.health_status, ("dim", "UNKNOWN")
     )
 
-    console.print()
-
-    # Health status header
-    console.print(f"Status: [{health_style}]{health_text}[/{health_style}]")
-    console.print()
-
-    # Answer
-    console.print(Panel(result.answer, title="[bold]Answer[/bold]", box=box.ROUNDED))
+    parts = [
+        # Health status header
+        Text.assemble("Status: ", (health_text, health_style)),
+        Text(),
+        # Answer
+        Panel(Text(result.answer), title=Text("Answer", style="bold"), box=box.ROUNDED),
+    ]
 
     if result.issues_found > 0:
-        console.print(f"\n[yellow]Issues found: {result.issues_found}[/yellow]")
+        parts.append(Text(f"\nIssues found: {result.issues_found}", style="yellow"))
 
     if result.recommendations:
-        console.print("\n[bold]Recommendations:[/bold]")
-        for rec in result.recommendations:
-            console.print(f"  - {rec}")
+        parts.append(Text("\nRecommendations:", style="bold"))
+        parts.extend(Text(f"  - {rec}") for rec in result.recommendations)
 
-    console.print()
+    console.print(Padding(Group(*parts), (1, 0)))
 
 
 def print_status_summary(summary: dict) -> None:
     """Print a status summary."""
+    if OUTPUT_FORMAT == "json":
+        _emit_json(
+            {"event": "status", **{k: v for k, v in summary.items() if k != "issues"}}
+        )
+        return
+
     table = Table(title="Status Summary", box=box.ROUNDED)
     table.add_column("Metric", style="cyan")
     table.add_column("Value", justify="right")
@@ -133,26 +403,41 @@ def print_status_summary(summary: dict) -> None:
     table.add_row("Total Issues", str(summary["total_issues"]))
 
     error_style = "red" if summary["error_count"] > 0 else "green"
-    table.add_row("Errors", f"[{error_style}]{summary['error_count']}[/{error_style}]")
+    table.add_row("Errors", Text(str(summary["error_count"]), style=error_style))
 
     warn_style = "yellow" if summary["warning_count"] > 0 else "green"
-    table.add_row("Warnings", f"[{warn_style}]{summary['warning_count']}[/{warn_style}]")
+    table.add_row("Warnings", Text(str(summary["warning_count"]), style=warn_style))
 
-    console.print()
-    console.print(table)
-    console.print()
+    console.print(Padding(table, (1, 0), expand=False))
 
 
 def print_error(message: str) -> None:
     """Print an error message."""
-    console.print(f"[bold red]Error:[/bold red] {message}")
+    _flush_log_lines()
+    if OUTPUT_FORMAT == "json":
+        _emit_json({"event": "error", "message": message})
+        return
+    console.print(Text.assemble(("Error:", "bold red"), " ", message))
 
 
 def print_info(message: str) -> None:
     """Print an info message."""
-    console.print(f"[cyan]{message}[/cyan]")
+    if OUTPUT_FORMAT == "json":
+        _emit_json({"event": "info", "message": message})
+        return
+    console.print(Text(message, style="cyan"))
+
+
+def print_stopped() -> None:
+    """Print that watching was stopped (Ctrl+C)."""
+    if OUTPUT_FORMAT == "json":
+        _emit_json({"event": "stopped"})
+        return
+    console.print(Text("\nStopped watching.", style="dim"))
 
 
 def print_waiting() -> None:
     """Print waiting indicator."""
-    console.print("[dim]Waiting for logs...[/dim]")
+    if OUTPUT_FORMAT == "json":
+        return
+    console.print(Text("Waiting for logs...", style="dim"))
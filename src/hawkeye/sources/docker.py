@@ -1,17 +1,79 @@
 """Docker container log source."""
 
 import asyncio
+import sys
 from collections.abc import AsyncIterator
 from datetime import datetime
-from queue import Queue, Empty
-from threading import Thread
+from threading import Lock, Thread
 
-from .base import LogLine, LogSource
+try:
+    import docker
+except ImportError:
+    docker = None
+
+from .base import LogLine, LogSource, fast_now
+
+
+if sys.version_info >= (3, 11):
+
+    def _parse_docker_ts(ts: str) -> datetime | None:
+        """
+        Parse a Docker log timestamp (2024-01-05T10:30:00.123456789Z).
+
+        fromisoformat accepts the trailing Z and nanosecond fractions as of
+        Python 3.11 (truncating to microseconds), so no rewriting is needed.
+        Returns None if it isn't a timestamp.
+        """
+        try:
+            return datetime.fromisoformat(ts)
+        except ValueError:
+            return None
+
+else:
+
+    def _parse_docker_ts(ts: str) -> datetime | None:
+        """
+        Parse a Docker log timestamp (2024-01-05T10:30:00.123456789Z).
+
+        Older fromisoformat only takes 3 or 6 fraction digits and no Z, so
+        the fixed layout is rewritten to that first. Returns None if it
+        isn't a timestamp.
+        """
+        if len(ts) >= 20 and ts[-1] == "Z":
+            if ts[19] == ".":
+                ts = f"{ts[:20]}{ts[20:-1][:6].ljust(6, '0')}+00:00"
+            else:
+                ts = f"{ts[:-1]}+00:00"
+        try:
+            return datetime.fromisoformat(ts)
+        except ValueError:
+            return None
+
+
+def _split_docker_line(line: bytes) -> tuple[str, datetime | None]:
+    """
+    Split a raw Docker log line into its content and timestamp.
+
+    The timestamp is None when the line doesn't start with one; only the
+    content after a recognised timestamp is decoded.
+    """
+    # Docker timestamps are at the start of the line
+    # Format: 2024-01-05T10:30:00.123456789Z message
+    if line[:1].isdigit():
+        sep = line.find(b" ")
+        if sep > 0:
+            ts = _parse_docker_ts(line[:sep].decode("ascii", errors="replace"))
+            if ts is not None:
+                return line[sep + 1 :].decode("utf-8", errors="replace"), ts
+    return line.decode("utf-8", errors="replace"), None
 
 
 class DockerSource(LogSource):
     """Watch logs from a Docker container."""
 
+    # Docker client shared by all sources, created on the first stream()
+    _client = None
+
     def __init__(self, container: str, tail: int = 0):
         """
         Initialize Docker log source.
@@ -24,59 +86,100 @@ class DockerSource(LogSource):
         self.tail = tail
         self._stop = False
         self._container = None
-        self._line_queue: Queue[str | None] = Queue()
+        # Batches of (content, timestamp) pairs, parsed on the reader thread
+        self._line_queue: asyncio.Queue[list[tuple[str, datetime | None]] | None] = (
+            asyncio.Queue()
+        )
         self._reader_thread: Thread | None = None
+        self._log_stream = None  # docker-py CancellableStream, closed to unblock the reader
         super().__init__(name=f"docker:{container}")
 
-    def _read_logs(self, container, tail_arg) -> None:
+    def _read_logs(self, container, tail_arg, loop: asyncio.AbstractEventLoop) -> None:
         """Background thread to read Docker logs."""
+
+        # Lines parsed since the loop last took a batch. Only one handoff is
+        # scheduled at a time; chunks arriving before it runs join its batch,
+        # so a fast stream costs one loop wakeup per drain, not per chunk.
+        pending: list[tuple[str, datetime | None]] = []
+        scheduled = False
+        lock = Lock()
+
+        def deliver() -> None:
+            nonlocal pending, scheduled
+            with lock:
+                batch, pending = pending, []
+                scheduled = False
+            self._line_queue.put_nowait(batch)
+
+        def call_in_loop(callback, *args) -> None:
+            # The loop may already be gone on shutdown
+            try:
+                loop.call_soon_threadsafe(callback, *args)
+            except RuntimeError:
+                pass
+
+        def emit(lines: list[tuple[str, datetime | None]]) -> None:
+            nonlocal scheduled
+            with lock:
+                pending.extend(lines)
+                if scheduled:
+                    return
+                scheduled = True
+            call_in_loop(deliver)
+
         try:
-            log_stream = container.logs(
+            log_stream = self._log_stream = container.logs(
                 stream=True,
                 follow=True,
                 tail=tail_arg,
                 timestamps=True,
             )
 
-            buffer = ""
+            buffer = bytearray()
             for chunk in log_stream:
                 if self._stop:
                     break
 
-                # Decode chunk and add to buffer
-                buffer += chunk.decode("utf-8", errors="replace")
-
-                # Process complete lines
-                while "\n" in buffer:
-                    line, buffer = buffer.split("\n", 1)
-                    if line:
-                        self._line_queue.put(line)
+                # Split off every complete line in one pass and send them as
+                # one batch; the partial last line waits for the next chunk
+                buffer.extend(chunk)
+                end = buffer.rfind(b"\n")
+                if end < 0:
+                    continue
+                # One copy of the complete lines (a plain slice would copy
+                # twice); the view must be released before the buffer shrinks
+                with memoryview(buffer) as view:
+                    complete = view[:end].tobytes()
+                lines = [_split_docker_line(line) for line in complete.split(b"\n") if line]
+                del buffer[: end + 1]
+                if lines:
+                    emit(lines)
 
             # Don't forget remaining buffer content
             if buffer and not self._stop:
-                self._line_queue.put(buffer)
+                emit([_split_docker_line(bytes(buffer))])
 
         except Exception as e:
             if not self._stop:
-                self._line_queue.put(f"ERROR: {e}")
+                emit([(f"ERROR: {e}", None)])
         finally:
-            self._line_queue.put(None)  # Signal end of stream
+            # Signal end of stream (runs after any handoff already scheduled)
+            call_in_loop(self._line_queue.put_nowait, None)
 
     async def stream(self) -> AsyncIterator[LogLine]:
         """Stream logs from the Docker container."""
-        try:
-            import docker
-        except ImportError:
+        if docker is None:
             raise ImportError("docker package required: pip install docker")
 
-        loop = asyncio.get_event_loop()
+        loop = asyncio.get_running_loop()
 
-        # Connect to Docker in a thread pool
-        client = await loop.run_in_executor(None, docker.from_env)
+        # Connect to Docker in a thread pool, once per process
+        if DockerSource._client is None:
+            DockerSource._client = await loop.run_in_executor(None, docker.from_env)
 
         try:
             self._container = await loop.run_in_executor(
-                None, client.containers.get, self.container_name
+                None, DockerSource._client.containers.get, self.container_name
             )
         except docker.errors.NotFound:
             raise ValueError(f"Container not found: {self.container_name}")
@@ -85,56 +188,40 @@ class DockerSource(LogSource):
         tail_arg = "all" if self.tail == -1 else self.tail
         self._reader_thread = Thread(
             target=self._read_logs,
-            args=(self._container, tail_arg),
+            args=(self._container, tail_arg, loop),
             daemon=True,
         )
         self._reader_thread.start()
 
-        # Read from queue
+        # Read batches of lines from the reader thread
         while not self._stop:
             try:
-                # Non-blocking get with timeout
-                line = await loop.run_in_executor(
-                    None, lambda: self._line_queue.get(timeout=0.1)
-                )
+                lines = await self._line_queue.get()
 
-                if line is None:
+                if lines is None:
                     break  # End of stream
 
-                # Docker timestamps are at the start of the line
-                # Format: 2024-01-05T10:30:00.123456789Z message
-                if " " in line and len(line) > 0 and line[0].isdigit():
-                    ts_str, content = line.split(" ", 1)
-                    try:
-                        # Parse Docker timestamp (handle nanoseconds)
-                        # Truncate nanoseconds to microseconds for Python
-                        if "." in ts_str:
-                            base, frac = ts_str.rsplit(".", 1)
-                            frac = frac.rstrip("Z")[:6]  # Keep only 6 digits
-                            ts_str = f"{base}.{frac}+00:00"
-                        else:
-                            ts_str = ts_str.replace("Z", "+00:00")
-                        ts = datetime.fromisoformat(ts_str)
-                    except ValueError:
-                        ts = datetime.now()
-                        content = line
-                else:
-                    ts = datetime.now()
-                    content = line
-
-                yield LogLine(
-                    content=content,
-                    timestamp=ts,
-                    source=self.name,
-                )
-
-            except Empty:
-                continue
+                for content, ts in lines:
+                    yield LogLine(
+                        content=content,
+                        timestamp=ts or fast_now(),
+                        source=self.name,
+                    )
+
             except Exception:
                 break
 
     async def close(self) -> None:
         """Stop watching container logs."""
         self._stop = True
+
+        # The reader blocks waiting for the next chunk; closing the stream
+        # makes that raise now instead of whenever the container logs again
+        if self._log_stream is not None:
+            try:
+                self._log_stream.close()
+            except Exception:
+                pass
+
         if self._reader_thread and self._reader_thread.is_alive():
             self._reader_thread.join(timeout=1.0)
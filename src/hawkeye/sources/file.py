@@ -1,13 +1,25 @@
 """File-based log source with tail-like functionality."""
 
 import asyncio
+import os
 from collections.abc import AsyncIterator
-from datetime import datetime
 from pathlib import Path
 
 import aiofiles
 
-from .base import LogLine, LogSource
+try:
+    from watchfiles import awatch
+except ImportError:
+    awatch = None
+
+from .base import LogLine, LogSource, fast_now
+
+
+# Bytes (or characters, for the polling reader) read per call when catching up
+READ_SIZE = 65536
+
+# Longest sleep between reads of an idle file when polling
+MAX_POLL_INTERVAL = 0.5
 
 
 class FileSource(LogSource):
@@ -17,6 +29,7 @@ class FileSource(LogSource):
         self.path = Path(path)
         self.follow = follow
         self._stop = False
+        self._stop_event = asyncio.Event()
         super().__init__(name=str(self.path))
 
     async def stream(self) -> AsyncIterator[LogLine]:
@@ -24,26 +37,77 @@ class FileSource(LogSource):
         if not self.path.exists():
             raise FileNotFoundError(f"Log file not found: {self.path}")
 
+        if self.follow and awatch is not None:
+            lines = self._stream_events()
+        else:
+            lines = self._stream_polling()
+
+        async for line in lines:
+            yield line
+
+    async def _stream_events(self) -> AsyncIterator[LogLine]:
+        """Follow the file, reading whatever was appended on each change notification."""
+        fd = os.open(self.path, os.O_RDONLY)
+        try:
+            os.lseek(fd, 0, os.SEEK_END)
+            partial = b""
+
+            # A short debounce still groups bursts of writes into one wakeup
+            async for _ in awatch(self.path, stop_event=self._stop_event, debounce=50, step=10):
+                while chunk := os.read(fd, READ_SIZE):
+                    data = partial + chunk
+                    end = data.rfind(b"\n")
+                    if end < 0:
+                        partial = data
+                        continue
+                    partial = data[end + 1 :]
+
+                    # Cut at a newline byte, so no UTF-8 sequence is split
+                    text = data[:end].decode("utf-8", errors="replace")
+                    for content in text.split("\n"):
+                        yield LogLine(
+                            content=content.rstrip("\r"),
+                            timestamp=fast_now(),
+                            source=self.name,
+                        )
+                    if self._stop:
+                        return
+        finally:
+            os.close(fd)
+
+    async def _stream_polling(self) -> AsyncIterator[LogLine]:
+        """Read the file in chunks, polling for new data if following."""
         async with aiofiles.open(self.path, mode="r") as f:
             # Go to end of file if following
             if self.follow:
                 await f.seek(0, 2)  # Seek to end
 
+            partial = ""
+            idle = 0  # Consecutive empty reads
             while not self._stop:
-                line = await f.readline()
-                if line:
-                    yield LogLine(
-                        content=line.rstrip("\n"),
-                        timestamp=datetime.now(),
-                        source=self.name,
-                    )
+                chunk = await f.read(READ_SIZE)
+                if chunk:
+                    idle = 0
+                    # Complete lines go out now; the partial last one waits
+                    *lines, partial = (partial + chunk).split("\n")
+                    for content in lines:
+                        yield LogLine(
+                            content=content,
+                            timestamp=fast_now(),
+                            source=self.name,
+                        )
                 elif self.follow:
-                    # No new line, wait a bit before checking again
-                    await asyncio.sleep(0.1)
+                    # No new data: check again soon after recent activity,
+                    # backing off to MAX_POLL_INTERVAL while the file is quiet
+                    await asyncio.sleep(min(MAX_POLL_INTERVAL, 0.01 * (1 << min(idle, 6))))
+                    idle += 1
                 else:
                     # Not following, we're done
+                    if partial:
+                        yield LogLine(content=partial, timestamp=fast_now(), source=self.name)
                     break
 
     async def close(self) -> None:
         """Stop the file watcher."""
         self._stop = True
+        self._stop_event.set()
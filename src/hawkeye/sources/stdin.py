@@ -3,9 +3,12 @@
 import asyncio
 import sys
 from collections.abc import AsyncIterator
-from datetime import datetime
 
-from .base import LogLine, LogSource
+from .base import LogLine, LogSource, fast_now
+
+
+# Bytes per read; matches the default pipe buffer
+READ_SIZE = 65536
 
 
 class StdinSource(LogSource):
@@ -17,24 +20,44 @@ class StdinSource(LogSource):
 
     async def stream(self) -> AsyncIterator[LogLine]:
         """Stream lines from stdin."""
-        loop = asyncio.get_event_loop()
+        loop = asyncio.get_running_loop()
         reader = asyncio.StreamReader()
         protocol = asyncio.StreamReaderProtocol(reader)
 
         await loop.connect_read_pipe(lambda: protocol, sys.stdin)
 
+        partial = b""
         while not self._stop:
             try:
-                line = await reader.readline()
-                if not line:
-                    break  # EOF
+                data = await reader.read(READ_SIZE)
+            except Exception:
+                break
+
+            if not data:
+                # EOF; the last line may have no newline
+                if partial:
+                    yield LogLine(
+                        content=partial.decode("utf-8", errors="replace"),
+                        timestamp=fast_now(),
+                        source=self.name,
+                    )
+                break
+
+            # Decode and split every complete line in the chunk at once; the
+            # partial last line waits for the next read
+            data = partial + data
+            end = data.rfind(b"\n")
+            if end < 0:
+                partial = data
+                continue
+            partial = data[end + 1 :]
+
+            for content in data[:end].decode("utf-8", errors="replace").split("\n"):
                 yield LogLine(
-                    content=line.decode().rstrip("\n"),
-                    timestamp=datetime.now(),
+                    content=content,
+                    timestamp=fast_now(),
                     source=self.name,
                 )
-            except Exception:
-                break
 
     async def close(self) -> None:
         """Stop reading from stdin."""
@@ -1,6 +1,7 @@
 """Main log watcher that coordinates all components."""
 
 import asyncio
+import time
 from pathlib import Path
 
 from .sources.base import LogSource
@@ -8,7 +9,7 @@ from .sources.file import FileSource
 from .sources.stdin import StdinSource
 from .sources.docker import DockerSource
 from .filter import LogFilter, FilterConfig
-from .buffer import LogBuffer
+from .buffer import IssueBatch, LogBuffer
 from .analyzer import LogAnalyzer
 from . import output
 
@@ -49,6 +50,13 @@ class LogWatcher:
         self.no_analysis = no_analysis
         self._running = False
 
+        # Set when the current batch's window closes (by _batch_timer)
+        self._batch_ready = asyncio.Event()
+        self._batch_timer: asyncio.TimerHandle | None = None
+
+        # Analysis requests currently awaiting a response
+        self._inflight: set[asyncio.Task] = set()
+
     @classmethod
     def from_file(cls, path: str | Path, **kwargs) -> "LogWatcher":
         """Create a watcher for a file."""
@@ -71,6 +79,7 @@ class LogWatcher:
         """Start watching logs."""
         self._running = True
         output.print_startup(self.source.name)
+        output.start_log_writer()
 
         # Start the batch processor
         batch_task = asyncio.create_task(self._process_batches())
@@ -83,8 +92,10 @@ class LogWatcher:
                 # Filter the line
                 result = self.filter.check(line.content)
 
-                # Add to buffer
+                # Add to buffer, arming the batch timer once a batch has started
                 self.buffer.add_line(line, result)
+                if self._batch_timer is None:
+                    self._schedule_batch_timer()
 
                 # Output based on settings
                 if result.should_analyze:
@@ -99,26 +110,53 @@ class LogWatcher:
         finally:
             self._running = False
             batch_task.cancel()
+            if self._batch_timer is not None:
+                self._batch_timer.cancel()
             await self.source.close()
 
-            # Flush any remaining batch
+            # Flush any remaining batch and wait for in-flight analyses
             final_batch = self.buffer.force_flush(self.source.name)
             if final_batch and self.analyzer and not self.no_analysis:
-                analysis = await self.analyzer.analyze_batch(final_batch)
-                output.print_analysis(analysis)
+                self._dispatch_analysis(final_batch)
+            if self._inflight:
+                await asyncio.gather(*self._inflight, return_exceptions=True)
+            output.stop_log_writer()
 
     async def _process_batches(self) -> None:
-        """Background task to process batches when ready."""
+        """Background task to process batches when their window closes."""
         while self._running:
-            await asyncio.sleep(1.0)  # Check every second
+            await self._batch_ready.wait()
+            self._batch_ready.clear()
+            self._batch_timer = None
 
             batch = self.buffer.get_batch_if_ready(self.source.name)
-            if batch and self.analyzer and not self.no_analysis:
-                try:
-                    analysis = await self.analyzer.analyze_batch(batch)
-                    output.print_analysis(analysis)
-                except Exception as e:
-                    output.print_error(f"Analysis failed: {e}")
+            if batch is None:
+                # Woke early (wall clock moved); wait for the real deadline
+                self._schedule_batch_timer()
+            elif self.analyzer and not self.no_analysis:
+                self._dispatch_analysis(batch)
+
+    def _schedule_batch_timer(self) -> None:
+        """Wake the batch processor when the current batch is due, if there is one."""
+        deadline = self.buffer.batch_deadline()
+        if deadline is not None:
+            self._batch_timer = asyncio.get_running_loop().call_later(
+                max(0.0, deadline - time.time()), self._batch_ready.set
+            )
+
+    def _dispatch_analysis(self, batch: IssueBatch) -> None:
+        """Analyze a batch in the background so batches overlap their API calls."""
+        task = asyncio.create_task(self._analyze(batch))
+        self._inflight.add(task)
+        task.add_done_callback(self._inflight.discard)
+
+    async def _analyze(self, batch: IssueBatch) -> None:
+        """Analyze a batch and print the result."""
+        try:
+            analysis = await self.analyzer.analyze_batch(batch)
+            output.print_analysis(analysis)
+        except Exception as e:
+            output.print_error(f"Analysis failed: {e}")
 
     async def ask(self, query: str, minutes: int = 30) -> None:
         """Answer a query about recent logs."""
@@ -148,5 +186,5 @@ class LogWatcher:
         output.print_status_summary(summary)
 
     def stop(self) -> None:
-        """Stop watching."""
+        """Stop watching (start() then flushes output and shuts down)."""
         self._running = False
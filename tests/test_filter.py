@@ -0,0 +1,88 @@
+"""Tests for the log pre-filter."""
+
+import random
+
+import pytest
+
+from hawkeye import filter as log_filter
+from hawkeye.filter import LogFilter
+
+
+@pytest.fixture
+def re_filter(monkeypatch) -> LogFilter:
+    """A LogFilter on the re path, where template keys are used."""
+    monkeypatch.setattr(log_filter, "hyperscan", None)
+    return LogFilter()
+
+
+def _timestamped_lines(count: int) -> list[str]:
+    rng = random.Random(0)
+    messages = [
+        "GET /api/items/{n} 200 in {ms}ms",
+        "user {n} logged in",
+        "ERROR connection refused to db-{ms}",
+        "WARN slow query took {ms}ms",
+        "request {n} returned 404",
+        "upstream returned 503 after {ms}ms",
+    ]
+    lines = []
+    for _ in range(count):
+        message = rng.choice(messages).format(
+            n=rng.randint(1, 999999), ms=rng.randint(1, 999)
+        )
+        lines.append(
+            f"2026-10-14 {rng.randint(0, 23):02d}:{rng.randint(0, 59):02d}:"
+            f"{rng.randint(0, 59):02d}.{rng.randint(0, 999):03d} [{rng.randint(1, 99999)}] "
+            + message
+        )
+    return lines
+
+
+def test_timestamped_lines_hit_template_cache(re_filter):
+    lines = _timestamped_lines(10000)
+    misses = 0
+    check_uncached = re_filter._check_uncached
+
+    def counting(line):
+        nonlocal misses
+        misses += 1
+        return check_uncached(line)
+
+    re_filter._check_uncached = counting
+    results = re_filter.check_many(lines)
+
+    assert misses < len(lines) // 20
+    reference = LogFilter()
+    assert results == [reference._check_uncached(line) for line in lines]
+
+
+def test_template_keeps_digit_runs_patterns_match(re_filter):
+    assert re_filter.check("10:30:00.404 GET /a 404").severity == "error"
+    assert re_filter.check("10:30:00.123 GET /b 200").severity == "info"
+    assert re_filter.check("10:30:00.999 GET /c 200 in 404ms").severity == "info"
+    assert re_filter.check("10:30:00.999 GET /c 502").severity == "error"
+
+
+@pytest.mark.skipif(log_filter.hyperscan is None, reason="needs hyperscan")
+@pytest.mark.parametrize(
+    "line",
+    [
+        "request timeout, then error",
+        "café: request timeout, then error",
+        "slow retry before the warning",
+        "naïve retry before the warning",
+        "504 after slow backend",
+    ],
+)
+def test_engines_report_the_same_pattern(line):
+    with_hyperscan = LogFilter()
+    assert with_hyperscan._hs_db is not None
+    expected = with_hyperscan._check_regex(line)
+
+    assert with_hyperscan._check_uncached(line) == expected
+    assert with_hyperscan._check_hyperscan(line) == expected
+
+
+def test_first_pattern_in_list_order_is_reported(re_filter):
+    assert re_filter.check("request timeout, then error").matched_pattern == "error"
+    assert re_filter.check("naïve retry before the warning").matched_pattern == "warning"